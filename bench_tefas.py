@@ -8,7 +8,7 @@ tefas = Crawler()
 def bench(start_date):
     t0 = time.time()
     try:
-        data = tefas.fetch(start=start_date, end="2024-12-18", name="MAC", kind="YAT")
+        data = tefas.fetch(start=start_date, end="2024-12-18", name="MAC", kind="YAT", columns=["date", "price"])
         dur = time.time() - t0
         print(f"Start: {start_date} -> Duration: {dur:.2f}s, Rows: {len(data)}")
     except Exception as e:
@@ -0,0 +1,28 @@
+import sys
+import json
+
+# orjson is optional: ~3-10x faster, falls back to stdlib json when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+def write_stdout(obj):
+    """Print obj as one JSON line without building an intermediate str"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(dumps(obj) + b"\n")
+    sys.stdout.buffer.flush()
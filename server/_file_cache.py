@@ -0,0 +1,50 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+# Cache lives next to the scripts so it survives across CLI invocations
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_ROOT = os.path.join(script_dir, '.cache')
+
+class FileCache:
+    """JSON-per-key disk cache. Keys are tuples, hashed with MD5 into file names."""
+
+    def __init__(self, namespace):
+        self.directory = os.path.join(CACHE_ROOT, namespace)
+
+    def _path(self, key):
+        raw = "|".join(str(part) for part in key)
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key, ttl=None, written_after=None):
+        """
+        Return the cached value, or None if missing/expired. ttl=None never expires.
+        written_after (epoch seconds) rejects entries written at or before that moment.
+        """
+        path = self._path(key)
+        try:
+            mtime = os.path.getmtime(path)
+            if ttl is not None and time.time() - mtime > ttl:
+                return None
+            if written_after is not None and mtime <= written_after:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Cache is best-effort, never fail the fetch because of it
+            pass
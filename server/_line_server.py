@@ -0,0 +1,43 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import _fast_json as fast_json
+
+def serve_lines(handle, workers=8):
+    """
+    Line-delimited JSON server used by the resident Python workers (see pythonWorker.ts).
+
+    Reads one request per line on stdin, {"id": 1, ...}, and answers each on stdout with
+    {"id": 1, "result": handle(request)} or {"id": 1, "error": "..."}. `handle` gets the
+    request without its id. Requests run on a thread pool, so replies may come out of
+    order; callers match them by id.
+    """
+    # The protocol owns stdout; anything libraries print goes to stderr instead
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+
+    def respond(message):
+        line = fast_json.dumps(message) + b"\n"
+        with write_lock:
+            out.buffer.write(line)
+            out.buffer.flush()
+
+    def process(req):
+        req_id = req.pop('id', None)
+        try:
+            respond({"id": req_id, "result": handle(req)})
+        except Exception as e:
+            respond({"id": req_id, "error": str(e)})
+
+    # Requests are mostly network bound, serve them concurrently and answer by id
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                req = fast_json.loads(line)
+            except ValueError as e:
+                respond({"id": None, "error": f"Invalid request: {e}"})
+                continue
+            executor.submit(process, req)
@@ -0,0 +1,203 @@
+import os
+import csv
+import json
+import sys
+import pickle
+import logging
+import functools
+import threading
+import subprocess
+from _file_cache import FileCache
+from _line_server import serve_lines
+
+# yfinance'ten bulunan isimler 30 gün diskte saklanır
+NAME_TTL = 30 * 24 * 60 * 60
+isim_cache = FileCache('names')
+# Liste oluşturma scriptine verilen süre
+REFRESH_TIMEOUT = 300
+# Sunucu modunda aynı anda işlenen istek sayısı; yfinance'e giden bir arama diğerlerini bekletmesin
+SERVER_WORKERS = 8
+
+class NameResolver:
+    """Symbol -> Name araması; önce verilen liste (CSV ya da yanındaki .pkl), sonra yfinance"""
+
+    def __init__(self, csv_path, refresh_script=None):
+        self.csv_path = csv_path
+        self.pkl_path = os.path.splitext(csv_path)[0] + '.pkl'
+        # Liste dosyası yoksa onu üreten script (ör. tum_piyasa_listesi.py)
+        self.refresh_script = refresh_script
+        names = self._yukle()
+        self.liste_eksik = names is None
+        self.names = names or {}
+
+    def _pkl_guncel_mi(self):
+        """Pickle, CSV'den eski değilse kullanılır; CSV elle/yeniden yazıldıysa CSV okunur"""
+        try:
+            return os.path.getmtime(self.pkl_path) >= os.path.getmtime(self.csv_path)
+        except FileNotFoundError:
+            # CSV yoksa elde sadece pickle var
+            return os.path.exists(self.pkl_path)
+
+    def _yukle(self):
+        """Arama tablosunu döner; liste dosyası hiç yoksa None"""
+        names = None
+        kaynak = self.pkl_path
+        if self._pkl_guncel_mi():
+            try:
+                # Liste scriptlerinin yazdığı pickle, CSV ayrıştırmaktan çok daha hızlı
+                with open(self.pkl_path, 'rb') as f:
+                    names = pickle.load(f).items()
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logging.exception("%s okunamadı, CSV'ye dönülüyor", self.pkl_path)
+        
+        if names is None:
+            # Pickle yoksa (ya da eskiyse) CSV'ye dön
+            kaynak = self.csv_path
+            try:
+                names = self._csv_oku()
+            except FileNotFoundError:
+                logging.warning("%s bulunamadı, aramalar yfinance'e gidecek", self.csv_path)
+                return None
+            except Exception:
+                logging.exception("%s okunamadı, tüm aramalar yfinance'e gidecek", self.csv_path)
+                names = []
+        return self._tablo_kur(names, kaynak)
+
+    def eksikse_olustur(self, arka_planda=False):
+        """
+        Liste dosyası hiç yoksa her arama yfinance'e gider; refresh_script ile oluşturup
+        yeniden yükler. arka_planda=True iken (sunucu modu) istekler bu sırada cevaplanmaya
+        devam eder, liste hazır olunca tablo değişir.
+        """
+        if not self.liste_eksik or not self.refresh_script:
+            return
+        if arka_planda:
+            threading.Thread(target=self._yenile_ve_yukle, daemon=True).start()
+        else:
+            self._yenile_ve_yukle()
+
+    def _yenile_ve_yukle(self):
+        self._yenile()
+        names = self._yukle()
+        if names is None:
+            logging.error("%s oluşturulamadı, tüm aramalar yfinance'e gidecek", self.csv_path)
+            return
+        # Tek atama: okuyan threadler ya eski ya yeni tabloyu görür
+        self.names = names
+        self.liste_eksik = False
+
+    @staticmethod
+    def _tablo_kur(pairs, kaynak):
+        """
+        (Symbol, Name) çiftlerinden arama tablosu. Anahtarlar yüklemede bir kere büyük harfe
+        çevrilir, aramada tekrar gerekmez. Tekrarlanan sembolde ilk kayıt kalır
+        (fetch-tefas-fund-name.py ile aynı) ve tekrarlar raporlanır.
+        """
+        names = {}
+        tekrarlar = 0
+        for sym, name in pairs:
+            kodu = str(sym).upper()
+            if kodu in names:
+                tekrarlar += 1
+            else:
+                names[kodu] = name
+        if tekrarlar:
+            logging.warning("%s: %d tekrarlanan sembol atlandı, ilk kayıt kullanıldı", kaynak, tekrarlar)
+        return names
+
+    def _csv_oku(self):
+        with open(self.csv_path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            # Sadece Symbol ve Name kolonları; satır başına dict kurulmaz, tip çıkarımı yok
+            header = next(reader)
+            sym_i, name_i = header.index('Symbol'), header.index('Name')
+            return [(row[sym_i], row[name_i]) for row in reader if len(row) > max(sym_i, name_i)]
+
+    def _yenile(self):
+        """refresh_script'i ayrı süreçte çalıştırır; çıktısı stdout'taki JSON'a karışmasın diye stderr'e"""
+        logging.warning("%s çalıştırılıyor", self.refresh_script)
+        try:
+            # stdin sunucu modunda protokole ait, alt sürece verilmez
+            subprocess.run([sys.executable, self.refresh_script], stdin=subprocess.DEVNULL,
+                           stdout=sys.stderr, timeout=REFRESH_TIMEOUT, check=True)
+        except Exception:
+            logging.exception("%s çalıştırılamadı", self.refresh_script)
+
+    def lookup(self, kodu):
+        """kodu büyük harfli gelmeli (giriş noktaları normalize eder)"""
+        # Önce listede ara
+        name = self.names.get(kodu)
+        if name is not None:
+            return str(name)
+        
+        # Listede yoksa yfinance'ten çek
+        return yfinance_ile_isim_getir(kodu)
+
+@functools.lru_cache(maxsize=512)
+def yfinance_ismi(kodu):
+    """
+    yfinance'ten ismi çeker, yoksa None. Sunucu modunda tekrar eden kodlar bellekten gelir;
+    hatalar fırlatıldığı için lru_cache'e girmez, bir sonraki istekte tekrar denenir.
+    """
+    cached = isim_cache.get((kodu,), ttl=NAME_TTL)
+    if cached is not None:
+        return cached
+    
+    # Sadece listede olmayan kodlar için yüklenir
+    import yfinance as yf
+    from _yahoo_session import timeout_session
+    
+    # Zaman aşımı oturumda (soket seviyesinde), signal.alarm gerekmez
+    ticker = yf.Ticker(kodu, session=timeout_session())
+    # info tek sefer çekilir (fast_info isim alanı içermiyor)
+    info = ticker.get_info() or {}
+    name = info.get('longName') or info.get('shortName')
+    
+    if name:
+        isim_cache.set((kodu,), name)
+    return name
+
+def yfinance_ile_isim_getir(kodu):
+    from curl_cffi.requests.exceptions import Timeout
+    
+    try:
+        return yfinance_ismi(kodu) or "İsim Bulunamadı"
+    except Timeout:
+        return "İsim Bulunamadı"
+    except Exception as e:
+        return "Bilinmeyen Kod"
+
+def sunucu_modu(resolver):
+    """
+    Sürekli çalışan mod (satır protokolü _line_server.py'de):
+    {"id": 1, "symbol": "AAPL"} -> {"id": 1, "result": {"name": "..."}}
+    """
+    serve_lines(lambda req: {"name": resolver.lookup(req["symbol"].strip().upper())},
+                workers=SERVER_WORKERS)
+
+def main(csv_path, refresh_script=None):
+    """
+    Ortak komut satırı: <script> SYMBOL [CSV] ya da <script> --server [CSV]
+    CSV verilmezse scriptin kendi listesi kullanılır; o da yoksa refresh_script ile oluşturulur.
+    """
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "Symbol gerekli"}))
+        sys.exit(1)
+    
+    if len(sys.argv) > 2:
+        resolver = NameResolver(sys.argv[2])
+    else:
+        resolver = NameResolver(csv_path, refresh_script)
+    
+    if sys.argv[1] == "--server":
+        # Önce istekleri karşılamaya başla; eksik liste arka planda oluşturulur
+        resolver.eksikse_olustur(arka_planda=True)
+        sunucu_modu(resolver)
+        sys.exit(0)
+    
+    # Tek seferlik çağrıda beklemek, her seferinde yfinance'e gitmekten iyi
+    resolver.eksikse_olustur()
+    symbol = sys.argv[1].strip().upper()
+    print(json.dumps({"name": resolver.lookup(symbol)}))
@@ -0,0 +1,5 @@
+def price_response(fiyat, symbol):
+    """JSON response for one symbol, shared by the price CLIs and price_daemon.py"""
+    if fiyat is not None:
+        return {"price": fiyat}
+    return {"error": f"Could not fetch price for {symbol}"}
@@ -0,0 +1,44 @@
+import threading
+from _file_cache import FileCache
+
+# Live quotes are reused for a short window so dashboard refreshes skip Yahoo
+QUOTE_TTL = 30
+quote_cache = FileCache('quotes')
+
+def last_price(symbol):
+    """Return fast_info['last_price'] for a Yahoo symbol, cached on disk for QUOTE_TTL seconds"""
+    cached = quote_cache.get((symbol,), ttl=QUOTE_TTL)
+    if cached is not None:
+        return cached
+    
+    # Imported here so cache hits don't pay the yfinance import
+    import yfinance as yf
+    price = yf.Ticker(symbol).fast_info['last_price']
+    
+    # Don't cache missing/NaN quotes
+    if price is not None and price == price:
+        quote_cache.set((symbol,), price)
+    return price
+
+# (connect, read) seconds, enforced on every request made through timeout_session()
+REQUEST_TIMEOUT = (3, 7)
+
+_timeout_session = None
+_session_lock = threading.Lock()
+
+def timeout_session():
+    """Return a shared curl_cffi session (the only kind yfinance accepts) with REQUEST_TIMEOUT forced"""
+    global _timeout_session
+    if _timeout_session is None:
+        with _session_lock:
+            if _timeout_session is None:
+                from curl_cffi import requests as curl_requests
+
+                class TimeoutSession(curl_requests.Session):
+                    # yfinance passes its own 30s timeout, so override rather than default it
+                    def request(self, *args, **kwargs):
+                        kwargs['timeout'] = REQUEST_TIMEOUT
+                        return super().request(*args, **kwargs)
+
+                _timeout_session = TimeoutSession(impersonate="chrome")
+    return _timeout_session
@@ -7,6 +7,14 @@ const execAsync = util.promisify(exec);
 
 const __dirname = path.join(process.cwd(), 'server');
 
+/**
+ * Price history as emitted by fetch-asset-history.py: parallel arrays, oldest first.
+ */
+export interface PriceHistory {
+    dates: string[];
+    prices: number[];
+}
+
 interface CashFlow {
     amount: number; // Negative for outflow (Buy), Positive for inflow (Sell/Current Value)
     date: Date;
@@ -224,7 +232,7 @@ export async function calculatePortfolioMonthlyChange(assets: Asset[], transacti
         // Phantom Assets cannot fetch history easily without symbol, falling back to Avg Sell Price logic below.
 
         // 4. Batch Fetch History
-        let historyData: Record<string, { date: string, price: number }[]> = {};
+        let historyData: Record<string, PriceHistory> = {};
         if (itemsToFetch.length > 0) {
             try {
                 const scriptPath = path.join(__dirname, 'fetch-asset-history.py');
@@ -247,12 +255,12 @@ export async function calculatePortfolioMonthlyChange(assets: Asset[], transacti
             groups[key].endValue += (Number(a.quantity) * Number(a.currentPrice));
 
             // Start Value Calculation
-            const hist = historyData[a.symbol || ""] || [];
+            const hist = historyData[a.symbol || ""];
             let priceT30 = Number(a.purchasePrice);
 
-            if (hist.length > 0) {
-                hist.sort((x, y) => new Date(x.date).getTime() - new Date(y.date).getTime());
-                priceT30 = hist[0].price;
+            if (hist && hist.prices.length > 0) {
+                // Already sorted oldest first
+                priceT30 = hist.prices[0];
             } else {
                 // Fallback: Use Current Price (Assume 0% change)
                 priceT30 = Number(a.currentPrice);
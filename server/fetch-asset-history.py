@@ -1,13 +1,147 @@
 #!/usr/bin/env python3
 import sys
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 import yfinance as yf
-from tefas import Crawler
+from _tefas_client import get_tefas
+from _file_cache import FileCache
+import _fast_json as fast_json
+
+# Library loggers only add noise to stderr; failures are reported per chunk/symbol
+logging.getLogger('yfinance').setLevel(logging.CRITICAL)
+logging.getLogger('tefas').setLevel(logging.CRITICAL)
+
+# Fully-past TEFAS chunks never change; the trailing chunk and Yahoo series refresh daily
+tefas_cache = FileCache('tefas-chunks')
+yf_cache = FileCache('yfinance-history')
+RECENT_TTL = 24 * 60 * 60
+# Chunks sit on a fixed 91-day grid so cache keys repeat across different start dates
+CHUNK_ORIGIN = datetime(2000, 1, 1)
+
+# Asset types served by TEFAS, everything else goes to Yahoo
+TEFAS_TYPES = ('fon', 'befas')
+# Batch dispatcher pool sizes per backend (TEFAS workers only wait on chunk_executor)
+TEFAS_WORKERS = 8
+YAHOO_WORKERS = 4
+# Concurrent TEFAS chunk requests for the whole process (all funds together),
+# kept low to stay under TEFAS rate limits and within the session's connection pool
+CHUNK_WORKERS = 6
+chunk_executor = ThreadPoolExecutor(max_workers=CHUNK_WORKERS)
+
+def cached_tefas_chunk(cache_key, c_end_str, immutable):
+    """
+    Cached rows for a chunk, or None. A past chunk is only trusted forever if it was
+    written after its last day had settled (end + 1 day); an entry fetched earlier may
+    miss that day's price. Empty chunks may be a transient failure, so they expire daily.
+    """
+    if immutable:
+        settled_at = (datetime.strptime(c_end_str, "%Y-%m-%d") + timedelta(days=1)).timestamp()
+        cached_rows = tefas_cache.get(cache_key, written_after=settled_at)
+        if cached_rows:
+            return cached_rows
+    return tefas_cache.get(cache_key, ttl=RECENT_TTL)
+
+def fetch_tefas_chunk(symbol, param_kind, c_start_str, c_end_str, immutable):
+    """Fetch one TEFAS chunk as [[date, price], ...], served from disk cache when possible"""
+    cache_key = (symbol.upper(), param_kind, c_start_str, c_end_str)
+    cached_rows = cached_tefas_chunk(cache_key, c_end_str, immutable)
+    if cached_rows is not None:
+        return cached_rows
+    
+    try:
+        # Fetch chunk (shared Crawler is created lazily, so cache hits never touch the network)
+        data = get_tefas().fetch(start=c_start_str, end=c_end_str, name=symbol.upper(), kind=param_kind)
+        
+        chunk_rows = []
+        if not data.empty:
+            # Normalize column names
+            data.columns = [c.lower() for c in data.columns]
+            
+            # tefas returns datetime.date objects (object dtype), convert once for .dt
+            if not pd.api.types.is_datetime64_any_dtype(data['date']):
+                data['date'] = pd.to_datetime(data['date'])
+            dates = data['date'].dt.strftime("%Y-%m-%d")
+            
+            chunk_rows = [list(row) for row in zip(dates.tolist(), data['price'].astype(float).tolist())]
+        
+        tefas_cache.set(cache_key, chunk_rows)
+        return chunk_rows
+    except Exception as chunk_err:
+        sys.stderr.write(f"Chunk failed {c_start_str}-{c_end_str}: {chunk_err}\n")
+        return []
+
+def to_columns(rows):
+    """Output shape: parallel arrays instead of repeating {date, price} keys per row"""
+    return {
+        "dates": [row[0] for row in rows],
+        "prices": [row[1] for row in rows],
+    }
+
+def format_yahoo_symbol(symbol, asset_type):
+    """Map our asset symbol to its Yahoo ticker"""
+    formatted_symbol = symbol.upper()
+    if asset_type == 'hisse' and not formatted_symbol.endswith('.IS'):
+        formatted_symbol += '.IS'
+    elif asset_type == 'kripto' and not formatted_symbol.endswith('-USD'):
+        formatted_symbol += '-USD'
+    return formatted_symbol
+
+def fetch_yahoo_history(items, start_date_str):
+    """
+    Fetch Yahoo histories for [(symbol, asset_type)] sharing one start date.
+    Cache misses are downloaded together in a single yf.download call.
+    Returns {symbol: [[date, price], ...]} oldest first.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    results = {}
+    missing = {}  # Yahoo ticker -> our symbols asking for it
+    
+    for symbol, asset_type in items:
+        formatted_symbol = format_yahoo_symbol(symbol, asset_type)
+        cached_rows = yf_cache.get((formatted_symbol, start_date_str, today), ttl=RECENT_TTL)
+        if cached_rows is not None:
+            results[symbol] = cached_rows
+        else:
+            missing.setdefault(formatted_symbol, []).append(symbol)
+    
+    if not missing:
+        return results
+    
+    # Fetch
+    try:
+        data = yf.download(" ".join(missing), start=start_date_str, group_by='ticker', progress=False, threads=True)
+    except Exception as e:
+        sys.stderr.write(f"Error: {e}\n")
+        data = None
+    
+    for formatted_symbol, symbols in missing.items():
+        rows = []
+        try:
+            if data is not None and not data.empty:
+                if isinstance(data.columns, pd.MultiIndex):
+                    closes = data[formatted_symbol]['Close']
+                else:
+                    closes = data['Close']
+                # Tickers are aligned on a shared index, drop the other markets' trading days
+                closes = closes.dropna()
+                rows = [list(row) for row in zip(closes.index.strftime("%Y-%m-%d").tolist(), closes.astype(float).tolist())]
+                if rows:
+                    yf_cache.set((formatted_symbol, start_date_str, today), rows)
+        except Exception as e:
+            sys.stderr.write(f"Error: {formatted_symbol}: {e}\n")
+        
+        for symbol in symbols:
+            results[symbol] = rows
+    
+    return results
 
 def fetch_history(symbol, asset_type, start_date_str):
     """
-    Fetch historical prices for an asset from start_date to now.
+    Fetch historical prices for an asset from start_date to now,
+    as [[date, price], ...] sorted oldest first.
     Supports: 
     - Funds (TEFAS)
     - Stocks/Crypto/ETF (Yahoo Finance)
@@ -16,18 +150,9 @@ def fetch_history(symbol, asset_type, start_date_str):
     
     try:
         # 1. TEFAS Funds
-        if asset_type in ['fon', 'befas']:
-            import os
-            from datetime import timedelta
-            
+        if asset_type in TEFAS_TYPES:
             # Note: stdout redirection removed from here to avoid threading race conditions
             
-            Crawler.root_url = "https://www.tefas.gov.tr"
-            Crawler.headers["Origin"] = "https://www.tefas.gov.tr"
-            Crawler.headers["Referer"] = "https://www.tefas.gov.tr/TarihselVeriler.aspx"
-            
-            tefas = Crawler()
-            
             # Parse start date
             try:
                 s_date = datetime.strptime(start_date_str, "%Y-%m-%d")
@@ -36,75 +161,45 @@ def fetch_history(symbol, asset_type, start_date_str):
 
             end_date = datetime.now()
             
-            # Chunking Loop (90 days chunks)
-            current_start = s_date
+            # Chunk boundaries (90 days chunks), aligned to the cache grid
+            s_date = s_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            grid_start = CHUNK_ORIGIN + timedelta(days=((s_date - CHUNK_ORIGIN).days // 91) * 91)
+            s_date_str = s_date.strftime("%Y-%m-%d")
             
             param_kind = "EMK" if asset_type == 'befas' else "YAT"
             
-            while current_start < end_date:
-                # Calculate chunk end
-                chunk_end = current_start + timedelta(days=90)
-                if chunk_end > end_date:
-                    chunk_end = end_date
-                    
-                c_start_str = current_start.strftime("%Y-%m-%d")
-                c_end_str = chunk_end.strftime("%Y-%m-%d")
-                
-                try:
-                    # Fetch chunk
-                    data = tefas.fetch(start=c_start_str, end=c_end_str, name=symbol.upper(), kind=param_kind)
-                    
-                    if not data.empty:
-                        # Normalize column names
-                        data.columns = [c.lower() for c in data.columns]
-                        
-                        for _, row in data.iterrows():
-                            d_val = row['date']
-                            if hasattr(d_val, 'strftime'):
-                                d_str = d_val.strftime("%Y-%m-%d")
-                            else:
-                                d_str = str(d_val) 
-                                
-                            results.append({
-                                "date": d_str,
-                                "price": float(row['price'])
-                            })
-                except Exception as chunk_err:
-                    sys.stderr.write(f"Chunk failed {c_start_str}-{c_end_str}: {chunk_err}\n")
-                
-                # Move to next chunk
-                current_start = chunk_end + timedelta(days=1)
+            end_ts = pd.Timestamp(end_date)
+            starts = pd.Series(pd.date_range(grid_start, end_ts, freq='91D'))
+            ends = (starts + pd.Timedelta(days=90)).clip(upper=end_ts)
+            # Chunks ending before yesterday are immutable
+            immutable = ends.dt.normalize() < (end_ts - pd.Timedelta(days=1)).normalize()
+            chunks = list(zip(
+                starts.dt.strftime("%Y-%m-%d").tolist(),
+                ends.dt.strftime("%Y-%m-%d").tolist(),
+                immutable.tolist(),
+            ))
             
-            return results
+            # Chunks are independent requests, overlap them on the network (map keeps order).
+            # The executor is shared, so concurrent funds queue behind the same CHUNK_WORKERS
+            chunk_results = chunk_executor.map(
+                lambda c: fetch_tefas_chunk(symbol, param_kind, c[0], c[1], c[2]), chunks
+            )
+            for chunk_rows in chunk_results:
+                results.extend(chunk_rows)
+            
+            # Grid alignment may fetch a few days before the requested start;
+            # tefas returns each chunk newest first, callers expect oldest first
+            return sorted((r for r in results if r[0] >= s_date_str), key=lambda r: r[0])
 
         # 2. Yahoo Finance (Stocks, US Stocks, Crypto, Gold, Benchmarks)
         else:
-            # Format Symbol
-            formatted_symbol = symbol.upper()
-            if asset_type == 'hisse' and not formatted_symbol.endswith('.IS'):
-                formatted_symbol += '.IS'
-            elif asset_type == 'kripto' and not formatted_symbol.endswith('-USD'):
-                formatted_symbol += '-USD'
-            
-            # Fetch
-            data = yf.download(formatted_symbol, start=start_date_str, progress=False, multi_level_index=False)
-            
-            if not data.empty:
-                for date, row in data.iterrows():
-                    results.append({
-                        "date": date.strftime("%Y-%m-%d"),
-                        "price": float(row['Close'])
-                    })
-            return results
+            return fetch_yahoo_history([(symbol, asset_type)], start_date_str)[symbol]
 
     except Exception as e:
         sys.stderr.write(f"Error: {e}\n")
         return []
 
 if __name__ == "__main__":
-    import sys
-    import os
-    
     # Check if input is a JSON list (starts with [)
     input_arg = "[]"
     if len(sys.argv) > 1:
@@ -118,36 +213,62 @@ if __name__ == "__main__":
     original_stdout = sys.stdout
     
     try:
-        # Redirect stdout to devnull to suppress library noise during processing
-        # This is process-global and safe for threads (they all write to devnull)
-        sys.stdout = open(os.devnull, 'w')
+        # Send library prints (e.g. tefas rate-limit retries) to stderr so they can't
+        # corrupt the JSON on stdout, but still show up in the server log
+        sys.stdout = sys.stderr
 
         # Try processing as batch JSON
         if input_arg.strip().startswith('['):
-            requests = json.loads(input_arg)
+            requests = fast_json.loads(input_arg)
             batch_results = {}
             
-            # Use threading to fetch in parallel
-            from concurrent.futures import ThreadPoolExecutor
+            # Use threading to fetch in parallel, with separate pools per backend:
+            # TEFAS is pure I/O, Yahoo is parse-heavy and rate limited
+            from concurrent.futures import as_completed
+            
+            def valid(req):
+                return req.get('symbol') and req.get('type') and req.get('startDate')
+
+            def process_tefas(i, req):
+                sym = req['symbol']
+                return [(i, (sym, fetch_history(sym, req['type'], req['startDate'])))]
+
+            def process_yahoo(start_date, group):
+                # One yf.download for every Yahoo symbol sharing this start date
+                history = fetch_yahoo_history([(req['symbol'], req['type']) for _, req in group], start_date)
+                return [(i, (req['symbol'], history.get(req['symbol'], []))) for i, req in group]
+
+            yf_groups = {}
+            ordered = [None] * len(requests)
+            with ThreadPoolExecutor(max_workers=TEFAS_WORKERS) as tefas_executor, \
+                    ThreadPoolExecutor(max_workers=YAHOO_WORKERS) as yf_executor:
+                futures = []
+                for i, req in enumerate(requests):
+                    if not valid(req):
+                        continue
+                    if req['type'] in TEFAS_TYPES:
+                        futures.append(tefas_executor.submit(process_tefas, i, req))
+                    else:
+                        yf_groups.setdefault(req['startDate'], []).append((i, req))
+                
+                for start_date, group in yf_groups.items():
+                    futures.append(yf_executor.submit(process_yahoo, start_date, group))
+                
+                for future in as_completed(futures):
+                    try:
+                        for i, item in future.result():
+                            ordered[i] = item
+                    except Exception as req_err:
+                        sys.stderr.write(f"Request failed: {req_err}\n")
             
-            def process_req(req):
-                sym = req.get('symbol')
-                typ = req.get('type')
-                sda = req.get('startDate')
-                if sym and typ and sda:
-                    return sym, fetch_history(sym, typ, sda)
-                return None, None
-
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                futures = [executor.submit(process_req, req) for req in requests]
-                for future in futures:
-                    sym, data = future.result()
-                    if sym:
-                        batch_results[sym] = data
+            # Emit in request order regardless of completion order
+            for item in ordered:
+                if item and item[0]:
+                    batch_results[item[0]] = to_columns(item[1])
             
             # Restore stdout for final output
             sys.stdout = original_stdout
-            print(json.dumps(batch_results))
+            fast_json.write_stdout(batch_results)
             
         else:
             # Legacy single mode fallback
@@ -158,10 +279,10 @@ if __name__ == "__main__":
                 hist = fetch_history(symbol, asset_type, start_date)
                 
                 sys.stdout = original_stdout
-                print(json.dumps(hist))
+                fast_json.write_stdout(to_columns(hist))
             else:
                 sys.stdout = original_stdout
-                print(json.dumps([]))
+                fast_json.write_stdout(to_columns([]))
                 
     except Exception as e:
         sys.stdout = original_stdout
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 import sys
 import json
+import logging
 import yfinance as yf
 from datetime import datetime, timedelta
 
+# Silence yfinance's failed-download chatter; we report "Price not found" ourselves
+logging.getLogger('yfinance').setLevel(logging.CRITICAL)
+
 def fetch_history(symbol, date_str):
     """
     Fetch historical close price for a symbol on or after a specific date.
@@ -16,12 +20,7 @@ def fetch_history(symbol, date_str):
 
         # yfinance download
         # period='1mo' is fallback, but start/end is precise
-        import os
-        import contextlib
-        
-        with open(os.devnull, 'w') as devnull:
-             with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
-                 data = yf.download(symbol, start=start_date, end=end_date, progress=False, multi_level_index=False)
+        data = yf.download(symbol, start=start_date, end=end_date, progress=False, multi_level_index=False)
         
         if not data.empty:
             # Get first available 'Close' price
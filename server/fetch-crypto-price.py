@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 import sys
 import json
+import time
 import requests
+from _file_cache import FileCache
+from _price_response import price_response
 
 # Mapping from crypto symbols to CoinGecko IDs
 CRYPTO_ID_MAP = {
@@ -37,36 +40,116 @@ CRYPTO_ID_MAP = {
     "MINA": "mina-protocol",
 }
 
-def fiyat_getir(symbol):
-    """Fetch crypto price from CoinGecko"""
-    symbol_upper = symbol.upper()
+# Keep-alive client reused for every CoinGecko call in the process.
+# HTTP/2 via httpx when it (and h2) is installed, plain requests otherwise.
+try:
+    import httpx
+    session = httpx.Client(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+    )
+except ImportError:
+    session = requests.Session()
+
+# Full CoinGecko symbol list, refreshed daily; CRYPTO_ID_MAP wins on ambiguous symbols
+coin_cache = FileCache('coingecko')
+COIN_LIST_TTL = 24 * 60 * 60
+# After a failed load (e.g. a free-tier 429) with nothing on disk, try again this soon
+COIN_LIST_RETRY = 60
+# Versioned so lists cached before ambiguous symbols were dropped are not reused
+COIN_LIST_KEY = ('coins_list', 'unique')
+# Live prices are reused briefly so repeated refreshes skip CoinGecko
+PRICE_TTL = 10
+_id_map = None
+_id_map_expires_at = 0
+
+def coin_id_map():
+    """Return the symbol -> CoinGecko ID map, bootstrapped from /coins/list"""
+    global _id_map, _id_map_expires_at
+    if _id_map is not None and time.time() < _id_map_expires_at:
+        return _id_map
+    
+    coins = coin_cache.get(COIN_LIST_KEY, ttl=COIN_LIST_TTL)
+    if coins is None:
+        try:
+            response = session.get("https://api.coingecko.com/api/v3/coins/list", timeout=10)
+            response.raise_for_status()
+            ids_by_symbol = {}
+            for coin in response.json():
+                ids_by_symbol.setdefault(coin['symbol'].upper(), []).append(coin['id'])
+            # Symbols shared by several coins (bridged/copycat tokens) are left out rather
+            # than guessed; CRYPTO_ID_MAP decides the ones we care about
+            coins = {symbol: ids[0] for symbol, ids in ids_by_symbol.items() if len(ids) == 1}
+            coin_cache.set(COIN_LIST_KEY, coins)
+        except Exception as e:
+            print(f"Error fetching coin list: {e}", file=sys.stderr)
+            # A stale list is still better than the static map alone
+            coins = coin_cache.get(COIN_LIST_KEY)
     
-    # Get CoinGecko ID from mapping
-    coingecko_id = CRYPTO_ID_MAP.get(symbol_upper)
+    if coins is None:
+        # Nothing loaded: serve the static map for now, but don't keep it for a whole TTL
+        _id_map = dict(CRYPTO_ID_MAP)
+        _id_map_expires_at = time.time() + COIN_LIST_RETRY
+    else:
+        _id_map = {**coins, **CRYPTO_ID_MAP}
+        _id_map_expires_at = time.time() + COIN_LIST_TTL
+    return _id_map
+
+def fiyatlari_getir(symbols):
+    """Fetch crypto prices from CoinGecko for several symbols in one request"""
+    # Map each symbol to its CoinGecko ID, skipping unknown ones
+    known_ids = coin_id_map()
+    id_map = {}
+    for symbol in symbols:
+        coingecko_id = known_ids.get(symbol.upper())
+        if coingecko_id:
+            id_map[symbol] = coingecko_id
     
-    if not coingecko_id:
-        return None
+    if not id_map:
+        return {}
     
     try:
-        url = f"https://api.coingecko.com/api/v3/simple/price?ids={coingecko_id}&vs_currencies=usd"
-        response = requests.get(url, timeout=10)
-        data = response.json()
+        ids = ",".join(sorted(set(id_map.values())))
+        data = coin_cache.get(('simple_price', ids), ttl=PRICE_TTL)
+        if data is None:
+            url = f"https://api.coingecko.com/api/v3/simple/price?ids={ids}&vs_currencies=usd"
+            response = session.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            coin_cache.set(('simple_price', ids), data)
         
-        if coingecko_id in data and "usd" in data[coingecko_id]:
-            fiyat = data[coingecko_id]["usd"]
-            return round(fiyat, 2)
+        prices = {}
+        for symbol, coingecko_id in id_map.items():
+            if coingecko_id in data and "usd" in data[coingecko_id]:
+                prices[symbol] = round(data[coingecko_id]["usd"], 2)
+        return prices
     except Exception as e:
         print(f"Error fetching price: {e}", file=sys.stderr)
     
-    return None
+    return {}
+
+def fiyat_getir(symbol):
+    """Fetch crypto price from CoinGecko"""
+    return fiyatlari_getir([symbol]).get(symbol)
+
+def parse_symbols(arg):
+    """Accept a JSON array or a comma-separated list of symbols"""
+    arg = arg.strip()
+    if arg.startswith('['):
+        return [str(s) for s in json.loads(arg)]
+    return [s.strip() for s in arg.split(',') if s.strip()]
+
+def build_response(symbol):
+    return price_response(fiyat_getir(symbol), symbol)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        symbol = sys.argv[1]
-        fiyat = fiyat_getir(symbol)
-        if fiyat is not None:
-            print(json.dumps({"price": fiyat}))
+        symbols = parse_symbols(sys.argv[1])
+        if len(symbols) == 1:
+            # Single symbol keeps the original {"price": ...} response
+            print(json.dumps(build_response(symbols[0])))
         else:
-            print(json.dumps({"error": f"Could not fetch price for {symbol}"}))
+            print(json.dumps(fiyatlari_getir(symbols)))
     else:
         print(json.dumps({"error": "No symbol provided"}))
@@ -3,6 +3,7 @@ import pandas as pd
 import requests
 import io
 import sys
+import pickle
 
 def etf_veritabani_olustur():
     try:
@@ -12,13 +13,21 @@ def etf_veritabani_olustur():
         url = "https://raw.githubusercontent.com/rreichel3/US-Stock-Symbols/main/etf/etf_list.csv"
         
         s = requests.get(url, timeout=10).content
-        df = pd.read_csv(io.StringIO(s.decode('utf-8')))
         
         # Bize sadece Sembol ve İsim lazım
-        df = df[['Symbol', 'Name']]
+        try:
+            df = pd.read_csv(io.BytesIO(s), usecols=['Symbol', 'Name'], engine='pyarrow')
+        except ImportError:
+            # pyarrow kurulu değilse C parser
+            df = pd.read_csv(io.BytesIO(s), usecols=['Symbol', 'Name'])
         
         # Dosyayı CSV olarak kaydedelim
         df.to_csv('etf_listesi.csv', index=False)
+        # İsim aramaları için Symbol -> Name sözlüğünü pickle olarak da kaydet
+        # (tekrarlanan sembolde ilk kayıt kalır, CSV okuyan yol ile aynı)
+        tekil = df.drop_duplicates(subset=['Symbol'], keep='first')
+        with open('etf_listesi.pkl', 'wb') as f:
+            pickle.dump(dict(zip(tekil['Symbol'], tekil['Name'])), f, protocol=5)
         
         print(f"Başarılı! Toplam {len(df)} adet ETF veritabanına kaydedildi.")
         print("Dosya adı: etf_listesi.csv")
@@ -2,18 +2,13 @@
 import sys
 import json
 from datetime import datetime, timedelta
-from tefas import Crawler
+from _tefas_client import get_tefas
 
 def fetch_historical_price(code, date_str):
     """Fetch fund price for a specific date"""
     code = code.upper()
     try:
-        # Monkeypatch Crawler to use Turkish site (TEFAS)
-        Crawler.root_url = "https://www.tefas.gov.tr"
-        Crawler.headers["Origin"] = "https://www.tefas.gov.tr"
-        Crawler.headers["Referer"] = "https://www.tefas.gov.tr/TarihselVeriler.aspx"
-        
-        tefas = Crawler()
+        tefas = get_tefas()
         
         # Parse input date (YYYY-MM-DD -> datetime)
         target_date = datetime.strptime(date_str, "%Y-%m-%d")
@@ -50,15 +45,14 @@ def fetch_historical_price(code, date_str):
     except Exception as e:
         return None
 
+def build_response(symbol, date):
+    price = fetch_historical_price(symbol, date)
+    if price is not None:
+        return {"price": price}
+    return {"error": "Price not found"}
+
 if __name__ == "__main__":
     if len(sys.argv) > 2:
-        code = sys.argv[1]
-        date_str = sys.argv[2]
-        price = fetch_historical_price(code, date_str)
-        
-        if price is not None:
-            print(json.dumps({"price": price}))
-        else:
-            print(json.dumps({"error": "Price not found"}))
+        print(json.dumps(build_response(sys.argv[1], sys.argv[2])))
     else:
         print(json.dumps({"error": "Usage: script.py <code> <YYYY-MM-DD>"}))
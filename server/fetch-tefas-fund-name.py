@@ -1,36 +1,58 @@
 #!/usr/bin/env python3
 import sys
 import json
-import pandas as pd
+import csv
+import pickle
+import functools
 import os
 
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(script_dir, 'tefas_tr_listesi.csv')
+# Pickled Symbol -> Name dict, rebuilt whenever the CSV is newer
+pkl_path = os.path.join(script_dir, 'tefas_tr_listesi.pkl')
+
+@functools.lru_cache(maxsize=1)
+def fon_listesi_yukle():
+    """Load the fund list as a plain dict, preferring the pickled copy"""
+    try:
+        if os.path.getmtime(pkl_path) >= os.path.getmtime(csv_path):
+            with open(pkl_path, 'rb') as f:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    
+    fon_db = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            fon_db.setdefault(row['Symbol'], row['Name'])
+    
+    try:
+        tmp_path = f"{pkl_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(fon_db, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, pkl_path)
+    except OSError:
+        pass
+    return fon_db
 
 def fon_ismi_bul(kod):
     """Look up Turkish fund name from CSV"""
     kod = kod.upper()
     
     try:
-        # Load the CSV with Symbol as index for faster lookup
-        fon_db = pd.read_csv(csv_path, index_col='Symbol')
-        
-        if kod in fon_db.index:
-            return fon_db.loc[kod]['Name']
-        else:
-            return None
+        return fon_listesi_yukle().get(kod)
     except:
         return None
 
+def build_response(symbol):
+    name = fon_ismi_bul(symbol)
+    if name:
+        return {"name": name}
+    return {"error": f"Could not find Turkish name for {symbol}"}
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        symbol = sys.argv[1]
-        name = fon_ismi_bul(symbol)
-        
-        if name:
-            print(json.dumps({"name": name}))
-        else:
-            print(json.dumps({"error": f"Could not find Turkish name for {symbol}"}))
+        print(json.dumps(build_response(sys.argv[1])))
     else:
         print(json.dumps({"error": "No symbol provided"}))
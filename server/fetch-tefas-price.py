@@ -1,36 +1,23 @@
 #!/usr/bin/env python3
 import sys
 import json
-from datetime import datetime, timedelta
-from tefas import Crawler
+from _tefas_client import fetch_recent
+from _price_response import price_response
 
 def fon_fiyati_getir(fon_kodu):
     """Fetch TEFAS fund price"""
     fon_kodu = fon_kodu.upper()
     
     try:
-        # Monkeypatch Crawler to use Turkish site
-        Crawler.root_url = "https://www.tefas.gov.tr"
-        Crawler.headers["Origin"] = "https://www.tefas.gov.tr"
-        Crawler.headers["Referer"] = "https://www.tefas.gov.tr/TarihselVeriler.aspx"
-        
-        tefas = Crawler()
-        
-        # Get today's date and 3 days ago (to handle weekends)
-        bugun = datetime.now().strftime("%Y-%m-%d")
-        gecmis = (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")
-        
-        # Fetch data from TEFAS
-        veriler = tefas.fetch(
-            start=gecmis, 
-            end=bugun, 
+        # Fetch the last 2 business days from TEFAS
+        veriler = fetch_recent(
             name=fon_kodu, 
-            columns=["code", "date", "price", "title"]
+            columns=["date", "price"]
         )
         
         if not veriler.empty:
-            # Sort by date and get the latest
-            son_veri = veriler.sort_values(by="date").iloc[-1]
+            # Latest row by date (O(n), no sort)
+            son_veri = veriler.loc[veriler['date'].idxmax()]
             
             fiyat = float(son_veri['price'])
             return round(fiyat, 6)
@@ -40,13 +27,11 @@ def fon_fiyati_getir(fon_kodu):
     except Exception as e:
         return None
 
+def build_response(symbol):
+    return price_response(fon_fiyati_getir(symbol), symbol)
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        symbol = sys.argv[1]
-        fiyat = fon_fiyati_getir(symbol)
-        if fiyat is not None:
-            print(json.dumps({"price": fiyat}))
-        else:
-            print(json.dumps({"error": f"Could not fetch price for {symbol}"}))
+        print(json.dumps(build_response(sys.argv[1])))
     else:
         print(json.dumps({"error": "No symbol provided"}))
@@ -1,25 +1,23 @@
 #!/usr/bin/env python3
 import sys
 import json
-import yfinance as yf
+from _yahoo_session import last_price
+from _price_response import price_response
 
 def fiyat_getir(hisse_kodu):
     """Fetch US stock or ETF price from Yahoo Finance"""
     try:
-        ticker = yf.Ticker(hisse_kodu)
-        # Get last price from fast_info
-        fiyat = ticker.fast_info['last_price']
+        # Get last price from fast_info (short-lived cache)
+        fiyat = last_price(hisse_kodu)
         return round(fiyat, 2)
     except Exception as e:
         return None
 
+def build_response(symbol):
+    return price_response(fiyat_getir(symbol), symbol)
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        symbol = sys.argv[1]
-        fiyat = fiyat_getir(symbol)
-        if fiyat is not None:
-            print(json.dumps({"price": fiyat}))
-        else:
-            print(json.dumps({"error": f"Could not fetch price for {symbol}"}))
+        print(json.dumps(build_response(sys.argv[1])))
     else:
         print(json.dumps({"error": "No symbol provided"}))
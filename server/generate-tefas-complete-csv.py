@@ -3,6 +3,11 @@ import pandas as pd
 from tefas import Crawler
 from datetime import datetime, timedelta
 
+def fon_tablosu(veriler):
+    """Her fon kodu için ilk başlığı tek geçişte alır -> Symbol/Name"""
+    return (veriler.groupby('code', sort=False, as_index=False)['title'].first()
+            .rename(columns={'code': 'Symbol', 'title': 'Name'}))
+
 def turkce_fon_listesi_olustur():
     """Generate complete TEFAS fund list with Turkish names"""
     print("TEFAS'tan tüm fonların Türkçe isimleri çekiliyor...")
@@ -21,11 +26,8 @@ def turkce_fon_listesi_olustur():
         )
         
         if veriler is not None and not veriler.empty:
-            # Duplikatları temizle
-            df_temiz = veriler[['code', 'title']].drop_duplicates(subset=['code']).reset_index(drop=True)
-            
-            # Sütun isimlerini değiştir
-            df_temiz.rename(columns={'code': 'Symbol', 'title': 'Name'}, inplace=True)
+            # Duplikatları temizle, sütun isimlerini değiştir
+            df_temiz = fon_tablosu(veriler)
             df_temiz['Tur'] = 'TEFAS'
             
             # CSV olarak kaydet
@@ -56,8 +58,7 @@ def turkce_fon_listesi_olustur():
             )
             
             if veriler is not None and not veriler.empty:
-                df_temiz = veriler[['code', 'title']].drop_duplicates(subset=['code']).reset_index(drop=True)
-                df_temiz.rename(columns={'code': 'Symbol', 'title': 'Name'}, inplace=True)
+                df_temiz = fon_tablosu(veriler)
                 df_temiz['Tur'] = 'TEFAS'
                 df_temiz.to_csv('tefas_tr_listesi.csv', index=False)
                 print(f"✓ Başarılı! {len(df_temiz)} adet fon kaydedildi.")
@@ -1,44 +1,66 @@
 #!/usr/bin/env python3
+import sys
+import logging
 import pandas as pd
-from tefas import Crawler
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from _tefas_client import get_tefas, supports_bulk_by_date
+
+# Her gün ayrı bir istek; günler paralel çekilir (kütüphane tarihe göre toplu çekebiliyorsa)
+GUN_SAYISI = 30
+WORKERS = 8
+
+# İlerleme ve örnek çıktıları sadece --verbose ile; hatalar her zaman görünür
+logger = logging.getLogger(__name__)
+
+def gunluk_fonlari_getir(tefas, gun):
+    """Tek bir günün fon kod/isimlerini çeker, hata olursa boş döner"""
+    try:
+        return tefas.fetch(start=gun, end=gun, columns=["code", "title"])
+    except Exception as e:
+        logger.warning("%s alınamadı: %s", gun, e)
+        return None
 
 def turkce_fon_listesi_olustur():
-    print("TEFAS'tan Türkçe fon isimleri çekiliyor...")
+    logger.info("TEFAS'tan Türkçe fon isimleri çekiliyor...")
     
     try:
-        tefas = Crawler()
+        tefas = get_tefas()
         
         # Get data from the last 30 days to capture all active funds
-        bugun = datetime.now().strftime("%Y-%m-%d")
-        gecmis = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        bugun = pd.Timestamp.now().normalize()
+        gunler = pd.date_range(bugun - pd.Timedelta(days=GUN_SAYISI), bugun).strftime("%Y-%m-%d")
         
-        # Fetch all fund data
-        veriler = tefas.fetch(
-            start=gecmis,
-            end=bugun,
-            columns=["code", "title"]
-        )
+        if supports_bulk_by_date():
+            # Fetch all fund data, one day per request
+            with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+                parcalar = list(executor.map(lambda gun: gunluk_fonlari_getir(tefas, gun), gunler))
+        else:
+            # Per-fund API: the fund list is fetched once regardless of dates, so one call
+            parcalar = [tefas.fetch(start=gunler[0], end=gunler[-1], columns=["code", "title"])]
+        parcalar = [df for df in parcalar if df is not None and not df.empty]
         
-        if veriler is not None and not veriler.empty:
-            # Remove duplicates and keep only code and title
-            df_temiz = veriler[['code', 'title']].drop_duplicates(subset=['code']).reset_index(drop=True)
+        if parcalar:
+            veriler = pd.concat(parcalar, ignore_index=True)
             
-            # Rename columns to match our schema
-            df_temiz.rename(columns={'code': 'Symbol', 'title': 'Name'}, inplace=True)
+            # One row per code (first title seen), renamed to match our schema
+            df_temiz = (veriler.groupby('code', sort=False, as_index=False)['title'].first()
+                        .rename(columns={'code': 'Symbol', 'title': 'Name'}))
             df_temiz['Tur'] = 'TEFAS'
             
             # Save as CSV
             df_temiz.to_csv('tefas_tr_listesi.csv', index=False)
             
-            print(f"Başarılı! {len(df_temiz)} adet fon Türkçe isimleriyle kaydedildi.")
-            print("\nÖrnekler:")
-            print(df_temiz.head(10).to_string())
+            logger.info("Başarılı! %d adet fon Türkçe isimleriyle kaydedildi.", len(df_temiz))
+            # Tablo metne çevirmek bedava değil, sadece gösterilecekse yap
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\nÖrnekler:\n%s", df_temiz.head(10).to_string())
         else:
-            print("Veri alınamadı")
+            logger.error("Veri alınamadı")
             
     except Exception as e:
-        print(f"Hata oluştu: {e}")
+        logger.error("Hata oluştu: %s", e)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO if '--verbose' in sys.argv else logging.WARNING,
+                        format='%(message)s')
     turkce_fon_listesi_olustur()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Long-lived price worker.
+
+Reads one JSON request per line on stdin: {"id": 1, "kind": "tefas", "symbol": "MAC"}
+and writes one JSON response per line on stdout: {"id": 1, "result": {...}}.
+`result` comes from the matching fetch-*.py script's build_response(), the
+same function its single-shot CLI prints, so the two can't drift apart.
+"""
+import os
+import logging
+import importlib.util
+from _line_server import serve_lines
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Handlers report their own failures; library loggers only add noise
+logging.getLogger('yfinance').setLevel(logging.CRITICAL)
+logging.getLogger('tefas').setLevel(logging.CRITICAL)
+
+def load_script(name):
+    """Import a hyphenated fetch script (e.g. fetch-tefas-price.py) as a module"""
+    module_name = name.replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(script_dir, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+crypto_price = load_script('fetch-crypto-price')
+tefas_price = load_script('fetch-tefas-price')
+befas_price = load_script('fetch-befas-price')
+us_stock_price = load_script('fetch-us-stock-price')
+bist_price = load_script('fetch-bist-price')
+currency_rate = load_script('fetch-currency-rate')
+historical_price = load_script('fetch-historical-price')
+tefas_fund_name = load_script('fetch-tefas-fund-name')
+
+# Each script's build_response() is exactly what its CLI prints
+HANDLERS = {
+    "crypto": crypto_price.build_response,
+    "tefas": tefas_price.build_response,
+    "befas": befas_price.build_response,
+    "us-stock": us_stock_price.build_response,
+    "bist": bist_price.build_response,
+    "currency-rate": currency_rate.build_response,
+    "historical-price": historical_price.build_response,
+    "tefas-fund-name": tefas_fund_name.build_response,
+}
+
+def handle(req):
+    handler = HANDLERS[req.pop('kind')]
+    return handler(**req)
+
+if __name__ == "__main__":
+    serve_lines(handle)
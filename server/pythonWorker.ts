@@ -0,0 +1,99 @@
+import { spawn, type ChildProcessWithoutNullStreams } from "child_process";
+import * as readline from "readline";
+
+// Timeouts in a row, with no reply in between, after which the process is treated as hung
+const MAX_CONSECUTIVE_TIMEOUTS = 2;
+
+type PendingCall = {
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+};
+
+/**
+ * Long-lived Python process speaking line-delimited JSON over stdin/stdout.
+ * Started on first call and restarted on the next call if it exits, so the
+ * interpreter and its imports (pandas, yfinance, tefas) are paid for once.
+ */
+export class PythonWorker {
+  private proc: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingCall>();
+  private nextId = 1;
+  private consecutiveTimeouts = 0;
+
+  constructor(private scriptPath: string, private args: string[] = []) {}
+
+  call(kind: string, params: Record<string, unknown> = {}, timeoutMs = 15000): Promise<any> {
+    const proc = this.ensureStarted();
+    const id = this.nextId++;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Python worker timed out after ${timeoutMs}ms (${kind})`));
+        // A wedged process never answers again; kill it so the next call respawns it
+        if (++this.consecutiveTimeouts >= MAX_CONSECUTIVE_TIMEOUTS) {
+          this.stop(proc, new Error("Python worker stopped responding, restarting"));
+        }
+      }, timeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      proc.stdin.write(JSON.stringify({ id, kind, ...params }) + "\n");
+    });
+  }
+
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.proc) return this.proc;
+
+    const proc = spawn("python3", [this.scriptPath, ...this.args]);
+    this.proc = proc;
+
+    readline.createInterface({ input: proc.stdout }).on("line", (line) => this.handleLine(line));
+    // Library noise and tracebacks end up on stderr; keep them visible in the server log
+    proc.stderr.on("data", (data) => process.stderr.write(data));
+
+    const onExit = (error?: Error) => this.stop(proc, error ?? new Error("Python worker exited"));
+    proc.on("exit", () => onExit());
+    proc.on("error", (err) => onExit(err));
+    proc.stdin.on("error", (err) => onExit(err));
+
+    return proc;
+  }
+
+  /** Fail every pending call and drop `proc`, killing it if it is still running. */
+  private stop(proc: ChildProcessWithoutNullStreams, reason: Error) {
+    if (this.proc !== proc) return;
+    this.proc = null;
+    this.consecutiveTimeouts = 0;
+    this.pending.forEach((call) => {
+      clearTimeout(call.timer);
+      call.reject(reason);
+    });
+    this.pending.clear();
+    if (proc.exitCode === null && proc.signalCode === null) proc.kill();
+  }
+
+  private handleLine(line: string) {
+    let message: any;
+    try {
+      message = JSON.parse(line);
+    } catch (e) {
+      console.error("Python worker sent invalid JSON:", line);
+      return;
+    }
+
+    // Any reply proves the process is alive, even one for an already timed-out call
+    this.consecutiveTimeouts = 0;
+
+    const call = this.pending.get(message.id);
+    if (!call) return;
+    this.pending.delete(message.id);
+    clearTimeout(call.timer);
+
+    if (message.error !== undefined) {
+      call.reject(new Error(message.error));
+    } else {
+      call.resolve(message.result);
+    }
+  }
+}
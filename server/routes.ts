@@ -5,16 +5,22 @@ import { storage } from "./storage";
 import { setupAuth, isAuthenticated } from "./replitAuth";
 import { insertAssetSchema, type Asset, type Transaction, insertAccountSchema, insertCategorySchema, insertCashTransactionSchema, insertBudgetSchema } from "@shared/schema";
 import { z } from "zod";
-import { exec, execSync } from "child_process";
+import { exec } from "child_process";
 import * as util from "util";
 import * as path from "path";
-import { calculateXIRR, getBenchmarkReturn, calculatePeriodReturn, calculatePortfolioMonthlyChange } from "./analytics";
+import { PythonWorker } from "./pythonWorker";
+import { calculateXIRR, getBenchmarkReturn, calculatePeriodReturn, calculatePortfolioMonthlyChange, type PriceHistory } from "./analytics";
 import { subMonths, subYears, isBefore, isAfter, parseISO } from "date-fns";
 
 const execAsync = util.promisify(exec);
 
 const __dirname = path.join(process.cwd(), 'server');
 
+// One warm Python process serves all price/fund lookups (see price_daemon.py)
+const priceDaemon = new PythonWorker(path.join(__dirname, 'price_daemon.py'));
+// Resident name lookup: the symbol list is loaded once instead of per request
+const assetNameWorker = new PythonWorker(path.join(__dirname, 'get-asset-name.py'), ['--server']);
+
 export async function registerRoutes(httpServer: Server, app: Express): Promise<void> {
   // Auth middleware
   await setupAuth(app);
@@ -77,9 +83,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
   // Currency rate
   app.get('/api/currency-rate', async (req: any, res) => {
     try {
-      const scriptPath = path.join(__dirname, 'fetch-currency-rate.py');
-      const result = execSync(`python3 ${scriptPath} `, { encoding: 'utf-8' });
-      const data = JSON.parse(result);
+      const data = await priceDaemon.call('currency-rate');
       res.json(data);
     } catch (error) {
       console.error("Error fetching currency rate:", error);
@@ -91,9 +95,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
   app.get('/api/asset-name/:symbol', async (req: any, res) => {
     try {
       const symbol = req.params.symbol.toUpperCase().trim();
-      const scriptPath = path.join(__dirname, 'get-asset-name.py');
-      const result = execSync(`python3 ${scriptPath} "${symbol}"`, { encoding: 'utf-8', timeout: 12000 });
-      const data = JSON.parse(result);
+      const data = await assetNameWorker.call('asset-name', { symbol }, 12000);
       res.json(data);
     } catch (error) {
       console.error("Error fetching asset name:", error);
@@ -105,9 +107,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
   app.get('/api/etf-name/:symbol', async (req: any, res) => {
     try {
       const symbol = req.params.symbol.toUpperCase().trim();
-      const scriptPath = path.join(__dirname, 'get-asset-name.py');
-      const result = execSync(`python3 ${scriptPath} "${symbol}"`, { encoding: 'utf-8', timeout: 12000 });
-      const data = JSON.parse(result);
+      const data = await assetNameWorker.call('asset-name', { symbol }, 12000);
       res.json(data);
     } catch (error) {
       console.error("Error fetching ETF name:", error);
@@ -431,9 +431,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
   app.get('/api/tefas-fund-name/:symbol', async (req: any, res) => {
     try {
       const symbol = req.params.symbol;
-      const scriptPath = path.join(__dirname, 'fetch-tefas-fund-name.py');
-      const result = execSync(`python3 ${scriptPath} "${symbol}"`, { encoding: 'utf-8', timeout: 15000 });
-      const data = JSON.parse(result);
+      const data = await priceDaemon.call('tefas-fund-name', { symbol }, 15000);
 
       if (data.name) {
         res.json({ name: data.name });
@@ -511,21 +509,14 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
         return res.status(400).json({ error: "Symbol and date are required" });
       }
 
-      const scriptPath = path.join(__dirname, 'fetch-historical-price.py');
-      // Use proper quoting for arguments
-      const command = `python3 ${scriptPath} "${symbol.toString().toUpperCase()}" "${date.toString()}"`;
-
-      const result = execSync(command, { encoding: 'utf-8', timeout: 15000 });
-      try {
-        const data = JSON.parse(result);
-        if (data.price) {
-          res.json({ price: data.price });
-        } else {
-          res.json({ error: data.error || "Price not found" });
-        }
-      } catch (e) {
-        console.error("Historical price parse error:", e);
-        res.status(500).json({ error: "Failed to parse price data" });
+      const data = await priceDaemon.call('historical-price', {
+        symbol: symbol.toString().toUpperCase(),
+        date: date.toString(),
+      }, 15000);
+      if (data.price) {
+        res.json({ price: data.price });
+      } else {
+        res.json({ error: data.error || "Price not found" });
       }
     } catch (error) {
       console.error("Error fetching historical price:", error);
@@ -558,9 +549,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
       if (type === 'kripto') {
         // Crypto: use Python script with CoinGecko API and proper symbol mapping
         try {
-          const scriptPath = path.join(__dirname, 'fetch-crypto-price.py');
-          const result = execSync(`python3 ${scriptPath} "${symbol.toUpperCase()}"`, { encoding: 'utf-8', timeout: 10000 });
-          const data = JSON.parse(result);
+          const data = await priceDaemon.call('crypto', { symbol: symbol.toUpperCase() }, 10000);
           if (data.price) {
             price = data.price;
           }
@@ -570,9 +559,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
       } else if (type === 'fon') {
         // TEFAS funds: use Python script with tefas-crawler library
         try {
-          const scriptPath = path.join(__dirname, 'fetch-tefas-price.py');
-          const result = execSync(`python3 ${scriptPath} "${symbol.toUpperCase()}"`, { encoding: 'utf-8', timeout: 30000 });
-          const data = JSON.parse(result);
+          const data = await priceDaemon.call('tefas', { symbol: symbol.toUpperCase() }, 30000);
           if (data.price) {
             price = data.price;
           } else if (data.error) {
@@ -584,9 +571,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
       } else if (type === 'befas') {
         // BEFAS funds: use Python script with tefas-crawler library (kind=EMK)
         try {
-          const scriptPath = path.join(__dirname, 'fetch-befas-price.py');
-          const result = execSync(`python3 ${scriptPath} "${symbol.toUpperCase()}"`, { encoding: 'utf-8', timeout: 30000 });
-          const data = JSON.parse(result);
+          const data = await priceDaemon.call('befas', { symbol: symbol.toUpperCase() }, 30000);
           if (data.price) {
             price = data.price;
           } else if (data.error) {
@@ -598,9 +583,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
       } else if (type === 'abd-hisse' || type === 'etf') {
         // US stocks and ETFs: use Python yfinance to get price
         try {
-          const scriptPath = path.join(__dirname, 'fetch-us-stock-price.py');
-          const result = execSync(`python3 ${scriptPath} "${symbol.toUpperCase()}"`, { encoding: 'utf-8', timeout: 10000 });
-          const data = JSON.parse(result);
+          const data = await priceDaemon.call('us-stock', { symbol: symbol.toUpperCase() }, 10000);
           if (data.price) {
             price = data.price;
           }
@@ -610,9 +593,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
       } else if (type === 'hisse') {
         // BIST stocks: use Python yfinance to get price
         try {
-          const scriptPath = path.join(__dirname, 'fetch-bist-price.py');
-          const result = execSync(`python3 ${scriptPath} "${symbol}"`, { encoding: 'utf-8', timeout: 10000 });
-          const data = JSON.parse(result);
+          const data = await priceDaemon.call('bist', { symbol: symbol }, 10000);
           if (data.price) {
             price = data.price;
           }
@@ -1032,7 +1013,7 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
         startDate: startStr
       })).filter(r => r.symbol);
 
-      let batchHistory: Record<string, any[]> = {};
+      let batchHistory: Record<string, PriceHistory> = {};
 
       try {
         if (batchRequests.length > 0) {
@@ -1069,14 +1050,8 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
             pythonProcess.stdin.end();
           }).then((output) => {
             try {
-              const rawHistory = JSON.parse(output as string);
-              // Ensure history is sorted Ascending (Oldest -> Newest)
-              for (const key in rawHistory) {
-                if (Array.isArray(rawHistory[key])) {
-                  rawHistory[key].sort((a: any, b: any) => new Date(a.date).getTime() - new Date(b.date).getTime());
-                }
-              }
-              batchHistory = rawHistory;
+              // History arrives sorted Ascending (Oldest -> Newest)
+              batchHistory = JSON.parse(output as string);
             } catch (jsonErr) {
               console.error("Failed to parse batch history JSON:", jsonErr, output);
             }
@@ -1111,16 +1086,14 @@ export async function registerRoutes(httpServer: Server, app: Express): Promise<
           } catch (xirrErr) { console.error(`XIRR error for ${asset.symbol}:`, xirrErr); }
 
           // B. Period Returns (Market Performance)
-          let history = (asset.symbol ? batchHistory[asset.symbol] : []) || [];
+          const history = asset.symbol ? batchHistory[asset.symbol] : undefined;
 
-          // Helper to find price at date
+          // Helper to find price at date (exact day, else the first trading day after it)
           const findPriceAt = (date: Date): number | null => {
-            if (!history || history.length === 0) return null;
+            if (!history || history.dates.length === 0) return null;
             const target = date.toISOString().split('T')[0];
-            const exact = history.find((h: any) => h.date === target);
-            if (exact) return exact.price;
-            const found = history.find((h: any) => h.date >= target);
-            if (found) return found.price;
+            const idx = history.dates.findIndex((d) => d >= target);
+            if (idx !== -1) return history.prices[idx];
             return null;
           };
 
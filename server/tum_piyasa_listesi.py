@@ -1,63 +1,121 @@
 #!/usr/bin/env python3
+import sys
+import logging
 import pandas as pd
 import requests
 import io
+import os
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+# İlerleme mesajları sadece --verbose ile; hatalar her zaman görünür
+logger = logging.getLogger(__name__)
+
+# (Tür, etiket, adres) - sıra önemli, tekrarlarda hisse kaydı kalır
+KAYNAKLAR = [
+    ('Hisse', 'hisse', "https://raw.githubusercontent.com/rreichel3/US-Stock-Symbols/main/stock/stock_list.csv"),
+    ('ETF', 'ETF', "https://raw.githubusercontent.com/rreichel3/US-Stock-Symbols/main/etf/etf_list.csv"),
+]
+
+# İki liste aynı sunucudan; tek keep-alive istemci bağlantıyı paylaşır.
+# httpx (ve h2) kuruluysa HTTP/2 ile tek bağlantı üzerinden, yoksa requests.
+try:
+    import httpx
+    session = httpx.Client(http2=True, timeout=10, follow_redirects=True)
+except ImportError:
+    session = requests.Session()
+
+# CSV'ler 5-10 kat sıkışıyor; sunucu gzip gönderirse requests .content'te kendisi açar
+HEADERS = {'Accept-Encoding': 'gzip, deflate'}
+
+# Son indirmelerin ETag'leri (url -> etag), CSV'nin yanında tutulur
+ETAG_DOSYASI = 'tum_piyasa_listesi.etag.json'
+# Kaynak son indirmeden beri değişmedi (304)
+DEGISMEDI = object()
+
+def etaglari_yukle():
+    # Önceki liste yoksa koşullu istek anlamsız, her şey baştan indirilir
+    if not os.path.exists('tum_piyasa_listesi.csv'):
+        return {}
+    try:
+        with open(ETAG_DOSYASI, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def kaynak_indir(tur, etiket, url, etag=None):
+    """
+    Tek bir listeyi indirip (Symbol/Name/Tur tablosu, etag) döner.
+    etag verilirse koşullu istek atılır, 304 gelirse DEGISMEDI döner. Hata olursa None.
+    """
+    try:
+        headers = dict(HEADERS, **({'If-None-Match': etag} if etag else {}))
+        resp = session.get(url, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            logger.info("  %s listesi değişmemiş", etiket)
+            return DEGISMEDI
+        resp.raise_for_status()
+        s = resp.content
+        # Byte'ları doğrudan oku; sadece symbol/name içeren kolonları metin olarak al
+        df = pd.read_csv(
+            io.BytesIO(s),
+            usecols=lambda c: 'symbol' in c.lower() or 'name' in c.lower(),
+            dtype=str,
+            keep_default_na=False,  # "NA" gibi semboller NaN'a dönmesin
+        )
+        # Column ismini dinamik olarak bul
+        symbol_col = next((c for c in df.columns if 'symbol' in c.lower()), 'Symbol')
+        name_col = next((c for c in df.columns if 'name' in c.lower()), 'Name')
+        
+        if symbol_col in df.columns and name_col in df.columns:
+            df = df[[symbol_col, name_col]].copy()
+            df.columns = ['Symbol', 'Name']
+            df['Tur'] = tur
+            logger.info("  %d %s yüklendi", len(df), etiket)
+            return df, resp.headers.get('ETag')
+    except Exception as e:
+        logger.error("  %s listesi yüklenemedi: %s", etiket, e)
+    return None
 
 def tum_piyasayi_guncelle():
-    print("Veriler çekiliyor, lütfen bekleyin...")
-    
-    combined_data = []
+    logger.info("Veriler çekiliyor, lütfen bekleyin...")
     
     try:
-        # 1. Hisse senetlerini indir
-        print("- Hisseler indiriliyor...")
-        url_stocks = "https://raw.githubusercontent.com/rreichel3/US-Stock-Symbols/main/stock/stock_list.csv"
-        try:
-            s_stock = requests.get(url_stocks, timeout=10).content
-            df_stocks = pd.read_csv(io.StringIO(s_stock.decode('utf-8')))
-            # Column ismini dinamik olarak bul
-            symbol_col = next((c for c in df_stocks.columns if 'symbol' in c.lower()), 'Symbol')
-            name_col = next((c for c in df_stocks.columns if 'name' in c.lower()), 'Name')
-            
-            if symbol_col in df_stocks.columns and name_col in df_stocks.columns:
-                df_stocks = df_stocks[[symbol_col, name_col]].copy()
-                df_stocks.columns = ['Symbol', 'Name']
-                df_stocks['Tur'] = 'Hisse'
-                combined_data.append(df_stocks)
-                print(f"  {len(df_stocks)} hisse yüklendi")
-        except Exception as e:
-            print(f"  Hisseler yüklenemedi: {e}")
+        # 1. Hisse ve ETF listelerini aynı anda indir (değişmediyse 304, gövde yok)
+        logger.info("- Hisseler ve ETF'ler indiriliyor...")
+        etaglar = etaglari_yukle()
+        with ThreadPoolExecutor(max_workers=len(KAYNAKLAR)) as executor:
+            sonuclar = list(executor.map(lambda kaynak: kaynak_indir(*kaynak, etaglar.get(kaynak[2])), KAYNAKLAR))
         
-        # 2. ETF'leri indir
-        print("- ETF'ler indiriliyor...")
-        url_etfs = "https://raw.githubusercontent.com/rreichel3/US-Stock-Symbols/main/etf/etf_list.csv"
-        try:
-            s_etf = requests.get(url_etfs, timeout=10).content
-            df_etfs = pd.read_csv(io.StringIO(s_etf.decode('utf-8')))
-            # Column ismini dinamik olarak bul
-            symbol_col = next((c for c in df_etfs.columns if 'symbol' in c.lower()), 'Symbol')
-            name_col = next((c for c in df_etfs.columns if 'name' in c.lower()), 'Name')
-            
-            if symbol_col in df_etfs.columns and name_col in df_etfs.columns:
-                df_etfs = df_etfs[[symbol_col, name_col]].copy()
-                df_etfs.columns = ['Symbol', 'Name']
-                df_etfs['Tur'] = 'ETF'
-                combined_data.append(df_etfs)
-                print(f"  {len(df_etfs)} ETF yüklendi")
-        except Exception as e:
-            print(f"  ETF'ler yüklenemedi: {e}")
+        if all(sonuc is DEGISMEDI for sonuc in sonuclar):
+            logger.info("\nListe güncel, değişiklik yok.")
+            return
+        # Sadece bir kaynak değiştiyse diğerini de baştan indir; birleşik listeden kaynak ayrıştırılamaz
+        sonuclar = [kaynak_indir(*kaynak) if sonuc is DEGISMEDI else sonuc
+                    for kaynak, sonuc in zip(KAYNAKLAR, sonuclar)]
+        combined_data = [sonuc[0] for sonuc in sonuclar if sonuc is not None]
         
-        # 3. Birleştir ve kaydet
+        # 2. Birleştir ve kaydet
         if combined_data:
             master_df = pd.concat(combined_data, ignore_index=True)
             master_df.drop_duplicates(subset=['Symbol'], keep='first', inplace=True)
             master_df.to_csv('tum_piyasa_listesi.csv', index=False)
-            print(f"\nTAMAM! Toplam {len(master_df)} varlık kaydedildi.")
+            # İsim aramaları için Symbol -> Name sözlüğünü pickle olarak da kaydet
+            with open('tum_piyasa_listesi.pkl', 'wb') as f:
+                pickle.dump(dict(zip(master_df['Symbol'], master_df['Name'])), f, protocol=5)
+            # Bir sonraki çalıştırmada koşullu istek için ETag'leri sakla
+            with open(ETAG_DOSYASI, 'w', encoding='utf-8') as f:
+                json.dump({kaynak[2]: sonuc[1] for kaynak, sonuc in zip(KAYNAKLAR, sonuclar)
+                           if sonuc is not None and sonuc[1]}, f)
+            logger.info("\nTAMAM! Toplam %d varlık kaydedildi.", len(master_df))
         else:
-            print("\nHiçbir veri yüklenemedi!")
+            logger.error("\nHiçbir veri yüklenemedi!")
             
     except Exception as e:
-        print(f"Genel hata: {e}")
+        logger.error("Genel hata: %s", e)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO if '--verbose' in sys.argv else logging.WARNING,
+                        format='%(message)s')
     tum_piyasayi_guncelle()